@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""
+Set based catalog queries used to pull constraint and index metadata for a
+whole schema at once instead of asking the SQLAlchemy inspector table by
+table, along with table and view listings that include/exclude filters can
+be pushed into.
+
+Every constraint query returns one row per constrained column with at least the
+``table_name``, ``name``, ``column_name`` and ``position`` fields, foreign
+keys add ``referred_schema``, ``referred_table`` and ``referred_column`` and
+indexes add ``is_unique``.
+"""
+
+CONSTRAINT_KINDS = (
+    "primary_keys", "foreign_keys", "unique_constraints", "indexes")
+
+# Postgres and Redshift both store key columns as arrays on pg_constraint, a
+# small generated series is used to unnest them since Redshift's leader node
+# lacks unnest/WITH ORDINALITY
+PG_KEY_SQL = """
+SELECT cl.relname AS table_name,
+       c.conname AS name,
+       a.attname AS column_name,
+       k.i AS position
+FROM pg_catalog.pg_constraint c
+JOIN pg_catalog.pg_class cl ON cl.oid = c.conrelid
+JOIN pg_catalog.pg_namespace n ON n.oid = cl.relnamespace
+CROSS JOIN (SELECT generate_series(1, 32) AS i) k
+JOIN pg_catalog.pg_attribute a
+  ON a.attrelid = c.conrelid AND a.attnum = c.conkey[k.i]
+WHERE n.nspname = :schema
+  AND c.contype = '{contype}'
+ORDER BY cl.relname, c.conname, k.i
+"""
+
+PG_FOREIGN_KEY_SQL = """
+SELECT cl.relname AS table_name,
+       c.conname AS name,
+       a.attname AS column_name,
+       rn.nspname AS referred_schema,
+       rcl.relname AS referred_table,
+       ra.attname AS referred_column,
+       k.i AS position
+FROM pg_catalog.pg_constraint c
+JOIN pg_catalog.pg_class cl ON cl.oid = c.conrelid
+JOIN pg_catalog.pg_namespace n ON n.oid = cl.relnamespace
+JOIN pg_catalog.pg_class rcl ON rcl.oid = c.confrelid
+JOIN pg_catalog.pg_namespace rn ON rn.oid = rcl.relnamespace
+CROSS JOIN (SELECT generate_series(1, 32) AS i) k
+JOIN pg_catalog.pg_attribute a
+  ON a.attrelid = c.conrelid AND a.attnum = c.conkey[k.i]
+JOIN pg_catalog.pg_attribute ra
+  ON ra.attrelid = c.confrelid AND ra.attnum = c.confkey[k.i]
+WHERE n.nspname = :schema
+  AND c.contype = 'f'
+ORDER BY cl.relname, c.conname, k.i
+"""
+
+# indkey is an int2vector which, unlike regular arrays, is zero based. An
+# indkey of 0 marks an expression column, which has no pg_attribute row so
+# its definition is taken from pg_get_indexdef instead. Only key columns are
+# reported, INCLUDE columns on PG11+ sit past indnkeyatts.
+PG_INDEX_SQL = """
+SELECT t.relname AS table_name,
+       ic.relname AS name,
+       COALESCE(a.attname, pg_catalog.pg_get_indexdef(
+           ix.indexrelid, k.i + 1, true)) AS column_name,
+       ix.indisunique AS is_unique,
+       k.i AS position
+FROM pg_catalog.pg_index ix
+JOIN pg_catalog.pg_class t ON t.oid = ix.indrelid
+JOIN pg_catalog.pg_class ic ON ic.oid = ix.indexrelid
+JOIN pg_catalog.pg_namespace n ON n.oid = t.relnamespace
+CROSS JOIN (SELECT generate_series(0, 31) AS i) k
+LEFT JOIN pg_catalog.pg_attribute a
+  ON a.attrelid = t.oid AND a.attnum = ix.indkey[k.i]
+  AND ix.indkey[k.i] <> 0
+WHERE n.nspname = :schema
+  AND NOT ix.indisprimary
+  AND k.i < ix.{key_count}
+ORDER BY t.relname, ic.relname, k.i
+"""
+
+# Redshift has no indexes, sort and distribution keys are the closest
+# equivalent and are recorded directly on pg_attribute
+REDSHIFT_INDEX_SQL = """
+SELECT c.relname AS table_name,
+       'sortkey' AS name,
+       a.attname AS column_name,
+       FALSE AS is_unique,
+       abs(a.attsortkeyord) AS position
+FROM pg_catalog.pg_attribute a
+JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = :schema
+  AND c.relkind = 'r'
+  AND a.attsortkeyord <> 0
+UNION ALL
+SELECT c.relname AS table_name,
+       'distkey' AS name,
+       a.attname AS column_name,
+       FALSE AS is_unique,
+       1 AS position
+FROM pg_catalog.pg_attribute a
+JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = :schema
+  AND c.relkind = 'r'
+  AND a.attisdistkey
+ORDER BY 1, 2, 5
+"""
+
+# Snowflake has no indexes and keeps key columns out of information_schema,
+# but SHOW commands list them for a whole schema in one call
+SNOWFLAKE_SHOW_SQL = {
+    "primary_keys": "SHOW PRIMARY KEYS IN SCHEMA {schema}",
+    "foreign_keys": "SHOW IMPORTED KEYS IN SCHEMA {schema}",
+    "unique_constraints": "SHOW UNIQUE KEYS IN SCHEMA {schema}",
+}
+
+# Map the SHOW output columns onto the common row fields
+SNOWFLAKE_COLUMN_MAP = {
+    "primary_keys": {
+        "table_name": "table_name", "name": "constraint_name",
+        "column_name": "column_name", "position": "key_sequence"},
+    "foreign_keys": {
+        "table_name": "fk_table_name", "name": "fk_name",
+        "column_name": "fk_column_name",
+        "referred_schema": "pk_schema_name",
+        "referred_table": "pk_table_name",
+        "referred_column": "pk_column_name", "position": "key_sequence"},
+    "unique_constraints": {
+        "table_name": "table_name", "name": "constraint_name",
+        "column_name": "column_name", "position": "key_sequence"},
+}
+
+CATALOG_SQL = {
+    "postgres": {
+        "primary_keys": PG_KEY_SQL.format(contype="p"),
+        "foreign_keys": PG_FOREIGN_KEY_SQL,
+        "unique_constraints": PG_KEY_SQL.format(contype="u"),
+        "indexes": PG_INDEX_SQL.format(key_count="indnkeyatts")},
+    "redshift": {
+        "primary_keys": PG_KEY_SQL.format(contype="p"),
+        "foreign_keys": PG_FOREIGN_KEY_SQL,
+        "unique_constraints": PG_KEY_SQL.format(contype="u"),
+        "indexes": REDSHIFT_INDEX_SQL},
+    "snowflake": SNOWFLAKE_SHOW_SQL,
+}
+
+# Listing tables and views in the catalog lets include/exclude filters be
+# applied by the database, {name_filter} is filled from a NameFilter
+PG_NAMES_SQL = """
+SELECT c.relname AS name
+FROM pg_catalog.pg_class c
+JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = :schema
+  AND c.relkind IN ({relkinds})
+  AND {{name_filter}}
+ORDER BY c.relname
+"""
+
+# Temporary and external tables are listed by SHOW TABLES so are kept here
+SNOWFLAKE_NAMES_SQL = """
+SELECT table_name AS name
+FROM information_schema.tables
+WHERE table_schema = :schema
+  AND table_type {table_types}
+  AND {{name_filter}}
+ORDER BY table_name
+"""
+
+PG_COUNT_COLUMNS_SQL = """
+SELECT COUNT(*) AS column_count
+FROM pg_catalog.pg_attribute a
+JOIN pg_catalog.pg_class c ON c.oid = a.attrelid
+JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = :schema
+  AND c.relkind IN ({relkinds})
+  AND a.attnum > 0
+  AND NOT a.attisdropped
+  AND {{name_filter}}
+"""
+
+SNOWFLAKE_COUNT_COLUMNS_SQL = """
+SELECT COUNT(*) AS column_count
+FROM information_schema.columns c
+JOIN information_schema.tables t
+  ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+WHERE c.table_schema = :schema
+  AND t.table_type {table_types}
+  AND {{name_filter}}
+"""
+
+# Used for dialects without catalog queries, which can't apply patterns
+INFORMATION_SCHEMA_COUNT_COLUMNS_SQL = """
+SELECT COUNT(*) AS column_count
+FROM information_schema.columns c
+JOIN information_schema.tables t
+  ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+WHERE c.table_schema = :schema
+  AND t.table_type = 'BASE TABLE'
+"""
+
+PG_RELKINDS = {
+    "postgres": {"tables": "'r', 'p'", "views": "'v', 'm'"},
+    "redshift": {"tables": "'r'", "views": "'v'"},
+}
+
+SNOWFLAKE_TABLE_TYPES = {
+    "tables": "NOT IN ('VIEW', 'MATERIALIZED VIEW')",
+    "views": "IN ('VIEW', 'MATERIALIZED VIEW')",
+}
+
+NAMES_SQL = {
+    "postgres": {
+        object_type: PG_NAMES_SQL.format(relkinds=relkinds)
+        for object_type, relkinds in PG_RELKINDS["postgres"].items()},
+    "redshift": {
+        object_type: PG_NAMES_SQL.format(relkinds=relkinds)
+        for object_type, relkinds in PG_RELKINDS["redshift"].items()},
+    "snowflake": {
+        object_type: SNOWFLAKE_NAMES_SQL.format(table_types=table_types)
+        for object_type, table_types in SNOWFLAKE_TABLE_TYPES.items()},
+}
+
+COUNT_COLUMNS_SQL = {
+    "postgres": PG_COUNT_COLUMNS_SQL.format(
+        relkinds=PG_RELKINDS["postgres"]["tables"]),
+    "redshift": PG_COUNT_COLUMNS_SQL.format(
+        relkinds=PG_RELKINDS["redshift"]["tables"]),
+    "snowflake": SNOWFLAKE_COUNT_COLUMNS_SQL.format(
+        table_types=SNOWFLAKE_TABLE_TYPES["tables"]),
+}
+
+# Column holding the object name in each catalog's listing queries
+NAME_COLUMNS = {
+    "postgres": "c.relname",
+    "redshift": "c.relname",
+    "snowflake": "table_name",
+}
+
+
+def get_catalog_sql(catalog_type, kind, server_version=None):
+    """
+    Look up the catalog query for a constraint kind, allowing for catalog
+    differences between server versions
+
+    :param catalog_type: string catalog type, postgres, redshift
+                         or snowflake
+    :param kind: string constraint kind, one of CONSTRAINT_KINDS
+    :param server_version: tuple with the server version, if known
+    :return: string containing the sql, or None if there is no query
+    """
+    sql = CATALOG_SQL.get(catalog_type, {}).get(kind)
+    # indnkeyatts only exists from postgres 11, before that every index
+    # column is a key column
+    if catalog_type == "postgres" and kind == "indexes" and \
+            server_version and tuple(server_version) < (11,):
+        sql = PG_INDEX_SQL.format(key_count="indnatts")
+    return sql
+
+
+def build_names_query(catalog_type, object_type, schema, name_filter):
+    """
+    Build the catalog query listing tables or views in a schema with the
+    include and exclude patterns pushed into it
+
+    :param catalog_type: string catalog type, postgres, redshift
+                         or snowflake
+    :param object_type: string, either tables or views
+    :param schema: string schema name as stored in the catalog
+    :param name_filter: NameFilter for the object type
+    :return: tuple of the sql and a dictionary of bind params
+    """
+    clause, params = name_filter.to_sql(
+        NAME_COLUMNS[catalog_type], catalog_type, "name")
+    params["schema"] = schema
+    return NAMES_SQL[catalog_type][object_type].format(
+        name_filter=clause), params
+
+
+def build_column_count_query(catalog_type, schema, table_filter):
+    """
+    Build the query counting table columns in a schema, limited to tables
+    matching the table patterns where the catalog allows
+
+    :param catalog_type: string catalog type, postgres, redshift, snowflake
+                         or None for dialects only read via the inspector
+    :param schema: string schema name as stored in the catalog
+    :param table_filter: NameFilter for tables
+    :return: tuple of the sql and a dictionary of bind params
+    """
+    if catalog_type not in COUNT_COLUMNS_SQL:
+        return INFORMATION_SCHEMA_COUNT_COLUMNS_SQL, {"schema": schema}
+    column = "t.table_name" if catalog_type == "snowflake" else "c.relname"
+    clause, params = table_filter.to_sql(column, catalog_type, "table")
+    params["schema"] = schema
+    return COUNT_COLUMNS_SQL[catalog_type].format(name_filter=clause), params
+
+
+def build_constraint_query(catalog_type, kind, schema, table_filter,
+                           server_version=None):
+    """
+    Build the catalog query for a constraint kind, limited to tables
+    matching the table patterns. Snowflake SHOW output can't be filtered in
+    sql so the patterns are left to the caller there.
+
+    :param catalog_type: string catalog type, postgres, redshift
+                         or snowflake
+    :param kind: string constraint kind, one of CONSTRAINT_KINDS
+    :param schema: string schema name, already quoted for snowflake
+    :param table_filter: NameFilter for tables
+    :param server_version: tuple with the server version, if known
+    :return: tuple of the sql and a dictionary of bind params
+    """
+    sql = get_catalog_sql(catalog_type, kind, server_version)
+    if catalog_type == "snowflake":
+        return sql.format(schema=schema), {}
+    params = {"schema": schema}
+    if table_filter:
+        clause, filter_params = table_filter.to_sql(
+            "q.table_name", catalog_type, "table")
+        sql = "SELECT * FROM ({sql}) q WHERE {clause}".format(
+            sql=sql, clause=clause)
+        params.update(filter_params)
+    return sql, params
+
+
+def group_constraint_rows(kind, rows):
+    """
+    Fold one row per constrained column into per table lists of
+    constraints shaped like the SQLAlchemy inspector output
+
+    :param kind: string constraint kind, one of CONSTRAINT_KINDS
+    :param rows: iterable of dictionaries with the common row fields
+    :return: dictionary keyed by table name holding lists of constraints
+    """
+    grouped = {}
+    constraints = {}
+    for row in sorted(rows, key=lambda r: (
+            r["table_name"], r["name"], int(r["position"]))):
+        key = (row["table_name"], row["name"])
+        if key not in constraints:
+            if kind == "primary_keys":
+                constraint = {"name": row["name"], "constrained_columns": []}
+            elif kind == "foreign_keys":
+                constraint = {"name": row["name"], "constrained_columns": [],
+                              "referred_schema": row["referred_schema"],
+                              "referred_table": row["referred_table"],
+                              "referred_columns": []}
+            elif kind == "unique_constraints":
+                constraint = {"name": row["name"], "column_names": []}
+            else:
+                constraint = {"name": row["name"], "column_names": [],
+                              "unique": bool(row["is_unique"])}
+            constraints[key] = constraint
+            grouped.setdefault(row["table_name"], []).append(constraint)
+        constraint = constraints[key]
+        if kind in ("primary_keys", "foreign_keys"):
+            constraint["constrained_columns"].append(row["column_name"])
+        else:
+            constraint["column_names"].append(row["column_name"])
+        if kind == "foreign_keys":
+            constraint["referred_columns"].append(row["referred_column"])
+    return grouped
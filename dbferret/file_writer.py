@@ -8,6 +8,17 @@ from dbferret.helpers import create_directory
 
 logging = logging.getLogger(__name__)
 
+# Written in place of index columns the inspector can't name
+EXPRESSION_COLUMN = "<expression>"
+
+# Extra fields written after schema, table, name and columns per kind
+CONSTRAINT_TSV_FIELDS = {
+    "primary_keys": (),
+    "foreign_keys": ("referred_schema", "referred_table", "referred_columns"),
+    "unique_constraints": (),
+    "indexes": ("unique",),
+}
+
 
 class FileWriter(object):
 
@@ -51,6 +62,19 @@ class FileWriter(object):
                 engine_type=self.engine_type,
                 db=self.db, timestamp=self.timestamp))
 
+    def get_constraint_tsv_default_path(self, kind):
+        """
+        Generate a default file path for a constraint tsv file
+
+        :param kind: string constraint kind, such as primary_keys or indexes
+        :return: string with path for file
+        """
+        return os.path.join(
+            "data",
+            "{engine_type}_{db}_{kind}_{timestamp}.tsv".format(
+                engine_type=self.engine_type, db=self.db, kind=kind,
+                timestamp=self.timestamp))
+
     def output_table_metadata_to_tsv(self, table_metadata, path=None):
         """
         Generate a tab separated file to store table metadata
@@ -130,3 +154,59 @@ class FileWriter(object):
                         except:
                             pass
         return sql_path
+
+    def output_constraint_metadata_to_tsv(self, kind, constraint_metadata,
+                                          path=None):
+        """
+        Generate a tab separated file to store one kind of constraint
+        metadata, multiple columns are comma delimited
+
+        :param kind: string constraint kind, such as primary_keys or indexes
+        :param constraint_metadata: dictionary of constraints grouped by
+                                    schema and table for this kind
+        :param path: string with the path where the file should be written
+        :return: string with path to the file
+        """
+        if path:
+            tsv_path = path
+        else:
+            create_directory()
+            tsv_path = self.get_constraint_tsv_default_path(kind)
+        logging.info(
+            "Outputting {kind} metadata file for {schema_count}"
+            " schemas: {tsv_path}".format(
+                kind=kind.replace("_", " "),
+                schema_count=len(constraint_metadata),
+                tsv_path=tsv_path))
+        fields = CONSTRAINT_TSV_FIELDS[kind]
+        with open(tsv_path, "w") as f:
+            f.write("\t".join(
+                '"{}"'.format(field) for field in
+                ("schema", "table", "name", "columns") + fields) + "\n")
+            for schema in constraint_metadata:
+                for table in constraint_metadata[schema]:
+                    for constraint in constraint_metadata[schema][table]:
+                        try:
+                            columns = constraint.get(
+                                "constrained_columns",
+                                constraint.get("column_names"))
+                            # The inspector reports expression index
+                            # columns as None
+                            values = [schema, table, constraint["name"],
+                                      ",".join(
+                                          EXPRESSION_COLUMN if c is None
+                                          else c for c in columns)]
+                            for field in fields:
+                                value = constraint.get(field)
+                                if isinstance(value, list):
+                                    value = ",".join(value)
+                                values.append(value)
+                            f.write(u"\t".join(
+                                u'"{}"'.format(value) for value in values
+                            ).encode("utf-8") + "\n")
+                        except Exception as e:
+                            logging.warn(
+                                "Could not write {kind} metadata for "
+                                "table {table}: {error}".format(
+                                    kind=kind, table=table, error=str(e)))
+        return tsv_path
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import re
+
+
+# Characters with special meaning in both python and POSIX regular
+# expressions that need escaping when translating a glob
+REGEX_SPECIAL_CHARS = set(".^$*+?()[]{}|\\")
+
+
+def parse_patterns(patterns):
+    """
+    Split a comma delimited string of patterns into a list
+
+    :param patterns: string of comma delimited patterns, or a list
+    :return: list of pattern strings
+    """
+    if not patterns:
+        return []
+    if not isinstance(patterns, (list, tuple)):
+        patterns = patterns.split(",")
+    return [p.strip() for p in patterns if p.strip()]
+
+
+def pattern_to_regex(pattern):
+    """
+    Translate a pattern into a regular expression usable by python and the
+    database. Patterns prefixed with re: are used as is, anything else is a
+    glob where * or % match any run of characters and ? matches exactly one.
+
+    :param pattern: string containing the pattern
+    :return: string containing the regular expression
+    """
+    if pattern.startswith("re:"):
+        return pattern[3:]
+    regex = []
+    for char in pattern:
+        if char in ("*", "%"):
+            regex.append(".*")
+        elif char == "?":
+            regex.append(".")
+        elif char in REGEX_SPECIAL_CHARS:
+            regex.append("\\" + char)
+        else:
+            regex.append(char)
+    return "^{}$".format("".join(regex))
+
+
+class NameFilter(object):
+
+    def __init__(self, include=None, exclude=None):
+        """
+        Select object names by include and exclude patterns, a name is kept
+        when it matches any include pattern (or there are none) and no
+        exclude pattern. Matching is case insensitive.
+
+        :param include: comma delimited string or list of patterns to keep
+        :param exclude: comma delimited string or list of patterns to skip
+        :return: name filter object
+        """
+        self.include = [pattern_to_regex(p) for p in parse_patterns(include)]
+        self.exclude = [pattern_to_regex(p) for p in parse_patterns(exclude)]
+
+    def __bool__(self):
+        return bool(self.include or self.exclude)
+
+    __nonzero__ = __bool__
+
+    def matches(self, name):
+        """
+        Check a name against the patterns
+
+        :param name: string containing an object name
+        :return: boolean indicating if the name should be kept
+        """
+        if self.include and not any(
+                re.search(p, name, re.IGNORECASE) for p in self.include):
+            return False
+        return not any(
+            re.search(p, name, re.IGNORECASE) for p in self.exclude)
+
+    def filter_names(self, names):
+        """
+        Keep only the names matching the patterns
+
+        :param names: iterable of object names
+        :return: list of object names
+        """
+        return [name for name in names if self.matches(name)]
+
+    def to_sql(self, column, catalog_type, prefix):
+        """
+        Build a where clause fragment so filtering happens in the catalog
+        query rather than after the fact
+
+        :param column: string column expression holding the object name
+        :param catalog_type: string catalog type, postgres, redshift
+                             or snowflake
+        :param prefix: string prefix keeping bind parameter names unique
+        :return: tuple of the sql fragment and a dictionary of bind params
+        """
+        if catalog_type == "snowflake":
+            condition = "REGEXP_INSTR({column}, :{param}, 1, 1, 0, 'i') > 0"
+        else:
+            condition = "{column} ~* :{param}"
+        clauses = ["1 = 1"]
+        params = {}
+        for kind, patterns in (("include", self.include),
+                               ("exclude", self.exclude)):
+            conditions = []
+            for i, regex in enumerate(patterns):
+                param = "{prefix}_{kind}_{i}".format(
+                    prefix=prefix, kind=kind, i=i)
+                params[param] = regex
+                conditions.append(condition.format(
+                    column=column, param=param))
+            if conditions:
+                clauses.append("{negate}({conditions})".format(
+                    negate="NOT " if kind == "exclude" else "",
+                    conditions=" OR ".join(conditions)))
+        return " AND ".join(clauses), params
@@ -1,19 +1,32 @@
 # -*- coding: utf-8 -*-
 import __future__
-from datetime import datetime, timedelta
 import os
 
 
 def elapsed_time(seconds):
     """
     When provided with a number of seconds, output a human readable 
-    string representing elapsed time
+    string representing elapsed time, hours keep counting past a day
     :param seconds: integer containing the number of seconds
     :return: string with elapsed time
     """
-    sec = timedelta(seconds=seconds)
-    d = datetime(1, 1, 1) + sec
-    return "%d hr %d min %d sec" % (d.hour, d.minute, d.second)
+    minutes, sec = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return "%d hr %d min %d sec" % (hours, minutes, sec)
+
+
+def readable_size(size):
+    """
+    When provided with a number of bytes, output a human readable
+    string representing the size
+    :param size: integer containing the number of bytes
+    :return: string with size
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return "%.1f %s" % (size, unit)
+        size /= 1024.0
+    return "%.1f TB" % size
 
 
 def incremental_marker(count, interval=5, range_start=0):
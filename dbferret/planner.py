@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Cost model used by the dry-run planning mode to estimate catalog round
+trips, wall time and memory of an extraction from object counts alone.
+"""
+from dbferret.catalog import CATALOG_SQL, CONSTRAINT_KINDS
+
+# Rough in memory footprint of each extracted object
+BYTES_PER_COLUMN = 1024
+BYTES_PER_VIEW = 4096
+BYTES_PER_CONSTRAINT = 512
+
+# Round trips each inspector call costs as (per schema, per object). With
+# SQLAlchemy 1.x postgres (also used for redshift) resolves a table oid once
+# per table and caches it, get_columns then also loads domains and enums and
+# get_pk_constraint looks up the columns and the constraint name separately.
+# snowflake-sqlalchemy fetches columns and keys for a whole schema on first
+# use and caches them.
+INSPECTOR_CALL_COSTS = {
+    "postgres": {
+        "get_table_names": (1, 0), "get_view_names": (1, 0),
+        "get_table_oid": (0, 1), "get_columns": (0, 3),
+        "get_view_definition": (0, 1), "get_pk_constraint": (0, 2),
+        "get_foreign_keys": (0, 1), "get_unique_constraints": (0, 1),
+        "get_indexes": (0, 1)},
+    "snowflake": {
+        "get_table_names": (1, 0), "get_view_names": (1, 0),
+        "get_table_oid": (0, 0), "get_columns": (1, 0),
+        "get_view_definition": (0, 1), "get_pk_constraint": (1, 0),
+        "get_foreign_keys": (1, 0), "get_unique_constraints": (1, 0),
+        "get_indexes": (0, 0)},
+    None: {
+        "get_table_names": (1, 0), "get_view_names": (1, 0),
+        "get_table_oid": (0, 0), "get_columns": (0, 1),
+        "get_view_definition": (0, 1), "get_pk_constraint": (0, 1),
+        "get_foreign_keys": (0, 1), "get_unique_constraints": (0, 1),
+        "get_indexes": (0, 1)},
+}
+INSPECTOR_CALL_COSTS["redshift"] = INSPECTOR_CALL_COSTS["postgres"]
+
+# Object type each inspector strategy iterates over and the calls it makes,
+# every strategy is costed on its own so includes its own oid lookups
+INSPECTOR_STRATEGIES = {
+    "table columns (inspector)": (
+        "tables", ("get_table_names", "get_table_oid", "get_columns")),
+    "view ddl (inspector)": (
+        "views", ("get_view_names", "get_view_definition")),
+    "constraints (inspector)": (
+        "tables", ("get_table_names", "get_table_oid", "get_pk_constraint",
+                   "get_foreign_keys", "get_unique_constraints",
+                   "get_indexes")),
+}
+
+
+def median(values):
+    """
+    Find the median of a list of numbers
+
+    :param values: list of numbers
+    :return: median value, 0 for an empty list
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2.0
+
+
+def estimate_extraction(counts, latency, catalog_type, schema_list=False):
+    """
+    Estimate round trips per extraction strategy along with the wall time
+    and memory an extraction would need
+
+    :param counts: dictionary keyed by schema holding table, view and
+                   column counts, a column count of None means unknown
+    :param latency: float with the round trip latency in seconds
+    :param catalog_type: string catalog type, postgres, redshift, snowflake
+                         or None for dialects only read via the inspector
+    :param schema_list: boolean indicating schemas were supplied by the user
+                        so no schema listing query is needed
+    :return: dictionary containing the estimate
+    """
+    schema_count = len(counts)
+    totals = {object_type: sum(c[object_type] for c in counts.values())
+              for object_type in ("tables", "views")}
+    if any(c["columns"] is None for c in counts.values()):
+        totals["columns"] = None
+    else:
+        totals["columns"] = sum(c["columns"] for c in counts.values())
+    schema_round_trips = 0 if schema_list else 1
+    costs = INSPECTOR_CALL_COSTS.get(catalog_type, INSPECTOR_CALL_COSTS[None])
+
+    round_trips = {}
+    for strategy, (object_type, calls) in INSPECTOR_STRATEGIES.items():
+        round_trips[strategy] = schema_round_trips + sum(
+            costs[call][0] * schema_count +
+            costs[call][1] * totals[object_type] for call in calls)
+    catalog_kinds = len(CATALOG_SQL.get(catalog_type, {}))
+    if catalog_kinds:
+        round_trips["constraints (catalog)"] = \
+            schema_round_trips + schema_count * catalog_kinds
+
+    estimated_seconds = {
+        strategy: trips * latency
+        for strategy, trips in round_trips.items()}
+    # Assume a table carries about one of each constraint kind, columns
+    # dominate so without a column count there is no useful estimate
+    if totals["columns"] is None:
+        estimated_bytes = None
+    else:
+        estimated_bytes = \
+            totals["columns"] * BYTES_PER_COLUMN + \
+            totals["views"] * BYTES_PER_VIEW + \
+            totals["tables"] * len(CONSTRAINT_KINDS) * BYTES_PER_CONSTRAINT
+
+    return {"tables": totals["tables"],
+            "views": totals["views"],
+            "columns": totals["columns"],
+            "round_trips": round_trips,
+            "latency": latency,
+            "estimated_seconds": estimated_seconds,
+            "estimated_bytes": estimated_bytes}
@@ -3,11 +3,17 @@ from datetime import datetime
 import logging
 import time
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.engine import reflection
 from snowflake.sqlalchemy import URL
 
-from dbferret.helpers import incremental_marker, elapsed_time
+from dbferret.catalog import (
+    CATALOG_SQL, CONSTRAINT_KINDS, NAMES_SQL, SNOWFLAKE_COLUMN_MAP,
+    build_column_count_query, build_constraint_query, build_names_query,
+    group_constraint_rows)
+from dbferret.filters import NameFilter
+from dbferret.helpers import incremental_marker, elapsed_time, readable_size
+from dbferret.planner import estimate_extraction, median
 
 
 CONNECTION_MAP = {"redshift": {"engine": "postgresql", "port": 5439},
@@ -29,7 +35,13 @@ class DbFerret(object):
                  schema,
                  port,
                  warehouse,
-                 schema_list):
+                 schema_list,
+                 include_schemas=None,
+                 exclude_schemas=None,
+                 include_tables=None,
+                 exclude_tables=None,
+                 include_views=None,
+                 exclude_views=None):
         """
         Connect to the db and use reflection to gather db metadata
 
@@ -45,6 +57,13 @@ class DbFerret(object):
         :param schema: string name of schema to query, primarily for snowflake
         :param warehouse: string name of warehouse if using snowflake
         :param schema_list: Comma delimited list of schemas to retrieve
+        :param include_schemas: Comma delimited glob or re: prefixed regex
+                                patterns of schemas to retrieve
+        :param exclude_schemas: Comma delimited patterns of schemas to skip
+        :param include_tables: Comma delimited patterns of tables to retrieve
+        :param exclude_tables: Comma delimited patterns of tables to skip
+        :param include_views: Comma delimited patterns of views to retrieve
+        :param exclude_views: Comma delimited patterns of views to skip
         :return: db ferret object
         """
 
@@ -58,9 +77,13 @@ class DbFerret(object):
         self.schema = schema
         self.warehouse = warehouse
         self.schema_list = schema_list
+        self.schema_filter = NameFilter(include_schemas, exclude_schemas)
+        self.table_filter = NameFilter(include_tables, exclude_tables)
+        self.view_filter = NameFilter(include_views, exclude_views)
         self.conn_string = None
         self.table_metadata = {}
         self.view_ddl = {}
+        self.constraint_metadata = {}
 
         print port
         if self.engine_type in CONNECTION_MAP:
@@ -70,6 +93,16 @@ class DbFerret(object):
             self.conn_type = self.engine_type.lower()
             self.port = port
 
+        # Which set of catalog queries, if any, can be used for bulk lookups
+        if self.engine_type == "redshift":
+            self.catalog_type = "redshift"
+        elif self.conn_type == "postgresql":
+            self.catalog_type = "postgres"
+        elif self.conn_type == "snowflake":
+            self.catalog_type = "snowflake"
+        else:
+            self.catalog_type = None
+
         if self.conn_type == "snowflake":
             self.engine = create_engine(URL(
                 account=self.hostname, user=self.user, password=self.pw,
@@ -95,12 +128,7 @@ class DbFerret(object):
 
         :return: dictionary containing table metadata
         """
-        if self.schema_list:
-            table_metadata = dict.fromkeys(
-                self.schema_list.replace(" ", "").split(","), {})
-        else:
-            table_metadata = dict.fromkeys(
-                self.inspector.get_schema_names(), {})
+        table_metadata = dict.fromkeys(self.get_schemas(), {})
         total_table_count = 0
         total_column_count = 0
         total_time_start = time.time()
@@ -114,8 +142,7 @@ class DbFerret(object):
         # 5th item in logging as a creature comfort
         for s, schema in enumerate(table_metadata):
             table_metadata[schema] = {
-                tab: [] for tab in list(self.inspector.get_table_names(
-                    schema=schema))}
+                tab: [] for tab in self.get_table_names(schema)}
             table_count = len(table_metadata[schema])
             logging.info("\t {star} {schema}".format(
                 star=incremental_marker(s), schema=schema.upper()))
@@ -164,15 +191,10 @@ class DbFerret(object):
 
         logging.info("EXTRACTING VIEW METADATA")
 
-        if self.schema_list:
-            schemas = self.schema_list.replace(" ", "").split(",")
-        else:
-            schemas = self.inspector.get_schema_names()
-
-        for s, schema in enumerate(schemas):
+        for s, schema in enumerate(self.get_schemas()):
             schema_time_start = time.time()
             view_ddl[schema] = dict.fromkeys(
-                self.inspector.get_view_names(schema=schema), {})
+                self.get_view_names(schema), {})
             view_count = len(view_ddl[schema])
             total_view_count += view_count
 
@@ -200,3 +222,295 @@ class DbFerret(object):
         # with open("data/view_ddl.json", "w") as tm:
         #    tm.write(str(self.view_ddl))
         return self.view_ddl
+
+    def get_schemas(self):
+        """
+        Retrieve the schemas to extract, either the user supplied list or
+        everything the inspector can see, narrowed by the schema patterns
+
+        :return: list of schema names
+        """
+        if self.schema_list:
+            schemas = self.schema_list.replace(" ", "").split(",")
+        else:
+            schemas = self.inspector.get_schema_names()
+        return self.schema_filter.filter_names(schemas)
+
+    def catalog_schema(self, schema):
+        """
+        Translate a schema name as reported by SQLAlchemy into the name
+        stored in the catalog, snowflake keeps unquoted names upper case
+
+        :param schema: string name of schema
+        :return: string name of schema as stored in the catalog
+        """
+        if self.catalog_type == "snowflake":
+            return self.engine.dialect.denormalize_name(schema)
+        return schema
+
+    def get_object_names(self, object_type, schema):
+        """
+        Retrieve the table or view names in a schema, pushing the include
+        and exclude patterns into the catalog query where the dialect allows
+        so excluded objects are never fetched. Without patterns the
+        inspector listing is used as is.
+
+        :param object_type: string, either tables or views
+        :param schema: string name of schema to query
+        :return: list of table or view names
+        """
+        if object_type == "tables":
+            name_filter = self.table_filter
+        else:
+            name_filter = self.view_filter
+        if not name_filter or self.catalog_type not in NAMES_SQL:
+            if object_type == "tables":
+                names = self.inspector.get_table_names(schema=schema)
+            else:
+                names = self.inspector.get_view_names(schema=schema)
+            return name_filter.filter_names(names)
+
+        sql, params = build_names_query(
+            self.catalog_type, object_type, self.catalog_schema(schema),
+            name_filter)
+        with self.engine.connect() as conn:
+            names = [row[0] for row in conn.execute(text(sql), **params)]
+        if self.catalog_type == "snowflake":
+            names = [self.engine.dialect.normalize_name(name)
+                     for name in names]
+        return names
+
+    def get_table_names(self, schema):
+        """
+        Retrieve the table names in a schema matching the table patterns
+
+        :param schema: string name of schema to query
+        :return: list of table names
+        """
+        return self.get_object_names("tables", schema)
+
+    def get_view_names(self, schema):
+        """
+        Retrieve the view names in a schema matching the view patterns
+
+        :param schema: string name of schema to query
+        :return: list of view names
+        """
+        return self.get_object_names("views", schema)
+
+    def fetch_catalog_rows(self, kind, schema):
+        """
+        Run the single set based catalog query for a constraint kind
+        against a schema, limited to tables matching the table patterns
+
+        :param kind: string constraint kind, one of CONSTRAINT_KINDS
+        :param schema: string name of schema to query
+        :return: list of dictionaries, one per constrained column
+        """
+        dialect = self.engine.dialect
+        with self.engine.connect() as conn:
+            if self.catalog_type == "snowflake":
+                schema = dialect.identifier_preparer.quote_identifier(
+                    self.catalog_schema(schema))
+            sql, params = build_constraint_query(
+                self.catalog_type, kind, schema, self.table_filter,
+                dialect.server_version_info)
+            result = conn.execute(text(sql), **params)
+            if self.catalog_type == "snowflake":
+                rows = [
+                    {field: dialect.normalize_name(row[column])
+                        if field != "position" else row[column]
+                     for field, column in
+                        SNOWFLAKE_COLUMN_MAP[kind].items()}
+                    for row in result]
+                # SHOW output can't be filtered in sql
+                return [row for row in rows
+                        if self.table_filter.matches(row["table_name"])]
+            return [dict(row) for row in result]
+
+    def inspect_constraints(self, kind, schema):
+        """
+        Fall back to the inspector to gather a constraint kind table by
+        table, used for dialects without a bulk catalog query
+
+        :param kind: string constraint kind, one of CONSTRAINT_KINDS
+        :param schema: string name of schema to query
+        :return: dictionary keyed by table name holding lists of constraints
+        """
+        constraints = {}
+        if schema in self.table_metadata:
+            tables = self.table_metadata[schema]
+        else:
+            tables = self.get_table_names(schema)
+        for table in tables:
+            if kind == "primary_keys":
+                pk = self.inspector.get_pk_constraint(
+                    table_name=table, schema=schema)
+                found = [pk] if pk and pk.get("constrained_columns") else []
+            elif kind == "foreign_keys":
+                found = self.inspector.get_foreign_keys(
+                    table_name=table, schema=schema)
+            elif kind == "unique_constraints":
+                try:
+                    found = self.inspector.get_unique_constraints(
+                        table_name=table, schema=schema)
+                except NotImplementedError:
+                    found = []
+            else:
+                found = self.inspector.get_indexes(
+                    table_name=table, schema=schema)
+            if found:
+                constraints[table] = found
+        return constraints
+
+    def extract_constraint_metadata(self):
+        """
+        Retrieve primary keys, foreign keys, unique constraints and indexes
+        from the database using one catalog query per kind per schema
+
+        :return: dictionary keyed by constraint kind containing
+                 constraint metadata grouped by schema and table
+        """
+        constraint_metadata = {kind: {} for kind in CONSTRAINT_KINDS}
+        total_time_start = time.time()
+
+        logging.info("EXTRACTING CONSTRAINT METADATA")
+
+        for s, schema in enumerate(self.get_schemas()):
+            schema_time_start = time.time()
+            logging.info("\t {star} {schema}".format(
+                star=incremental_marker(s), schema=schema.upper()))
+
+            for kind in CONSTRAINT_KINDS:
+                sql = CATALOG_SQL.get(self.catalog_type, {}).get(kind)
+                if self.catalog_type == "snowflake" and not sql:
+                    # Nothing to look up, e.g. snowflake has no indexes
+                    constraints = {}
+                elif sql:
+                    try:
+                        constraints = group_constraint_rows(
+                            kind, self.fetch_catalog_rows(kind, schema))
+                    except Exception as e:
+                        logging.warn(
+                            "Catalog query for {kind} failed, falling back "
+                            "to inspector: {error}".format(
+                                kind=kind, error=str(e)))
+                        constraints = self.inspect_constraints(kind, schema)
+                else:
+                    constraints = self.inspect_constraints(kind, schema)
+                constraint_metadata[kind][schema] = constraints
+                logging.info("\t\t\t{kind:>14}: {count}".format(
+                    kind=kind.replace("_", " "),
+                    count=sum(len(c) for c in constraints.values())))
+
+            logging.debug("\t\t\texecution time: {}".format(
+                elapsed_time(time.time() - schema_time_start)))
+
+        total_time_end = time.time()
+        logging.info("  Total time taken: {}".format(
+            elapsed_time(total_time_end - total_time_start)))
+        self.constraint_metadata = constraint_metadata
+        return self.constraint_metadata
+
+    def count_catalog_objects(self, schema):
+        """
+        Count the tables, views and table columns in a schema that match
+        the include and exclude patterns. Tables and views are listed the
+        same way the extraction lists them, columns with one count query.
+
+        :param schema: string name of schema to query
+        :return: dictionary with table, view and column counts, the column
+                 count is None when it could not be queried
+        """
+        sql, params = build_column_count_query(
+            self.catalog_type, self.catalog_schema(schema), self.table_filter)
+        try:
+            with self.engine.connect() as conn:
+                columns = int(conn.execute(text(sql), **params).scalar() or 0)
+        # Not every database has an information_schema to count from
+        except Exception as e:
+            logging.warn(
+                "Could not count columns in {schema}, column count and "
+                "memory estimate will be unknown: {error}".format(
+                    schema=schema, error=str(e)))
+            columns = None
+        return {"tables": len(self.get_table_names(schema)),
+                "views": len(self.get_view_names(schema)),
+                "columns": columns}
+
+    def measure_latency(self, samples=5):
+        """
+        Time a trivial probe query on an already warm connection so the
+        result reflects a single catalog round trip rather than connection
+        setup or heavy aggregate queries
+
+        :param samples: integer number of probes to time
+        :return: float with the median round trip latency in seconds
+        """
+        latencies = []
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1")).fetchall()
+            for _ in range(samples):
+                query_time_start = time.time()
+                conn.execute(text("SELECT 1")).fetchall()
+                latencies.append(time.time() - query_time_start)
+        return median(latencies)
+
+    def plan_extraction(self):
+        """
+        Estimate the cost of a crawl without extracting anything, reporting
+        catalog round trips per extraction strategy along with the expected
+        wall time and memory
+
+        :return: dictionary containing the extraction plan
+        """
+        counts = {}
+        total_time_start = time.time()
+
+        logging.info("PLANNING EXTRACTION")
+
+        if self.table_filter and self.catalog_type not in CATALOG_SQL:
+            logging.warn("Table patterns can't be applied to the column "
+                         "count for this database, it covers every table")
+        latency = self.measure_latency()
+        schemas = self.get_schemas()
+        logging.info("Total schema count: {schema_count}".format(
+            schema_count=len(schemas)))
+
+        for s, schema in enumerate(schemas):
+            counts[schema] = self.count_catalog_objects(schema)
+            logging.info("\t {star} {schema}".format(
+                star=incremental_marker(s), schema=schema.upper()))
+            for kind in ("tables", "views", "columns"):
+                count = counts[schema][kind]
+                logging.info("\t\t\t{kind:>14}: {count}".format(
+                    kind=kind[:-1] + " count",
+                    count="unknown" if count is None else count))
+
+        plan = estimate_extraction(
+            counts, latency, self.catalog_type,
+            schema_list=bool(self.schema_list))
+        logging.info(" Total table count: {table_count}".format(
+            table_count=plan["tables"]))
+        logging.info("  Total view count: {view_count}".format(
+            view_count=plan["views"]))
+        logging.info("Total column count: {column_count}".format(
+            column_count="unknown" if plan["columns"] is None
+            else plan["columns"]))
+        logging.info("     Query latency: {latency:.3f} sec".format(
+            latency=latency))
+        for strategy in sorted(plan["round_trips"]):
+            logging.info("\t{strategy}: {trips} round trips, "
+                         "about {elapsed}".format(
+                             strategy=strategy,
+                             trips=plan["round_trips"][strategy],
+                             elapsed=elapsed_time(
+                                 plan["estimated_seconds"][strategy])))
+        logging.info("  Estimated memory: {size}".format(
+            size="unknown" if plan["estimated_bytes"] is None
+            else readable_size(plan["estimated_bytes"])))
+        logging.info("  Total time taken: {}".format(
+            elapsed_time(time.time() - total_time_start)))
+
+        plan["schemas"] = counts
+        return plan
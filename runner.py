@@ -30,16 +30,31 @@ def main():
                         db=args.db, ssl_mode=args.ssl_mode,
                         engine_type=args.engine_type, schema=args.schema,
                         port=args.port, warehouse=args.warehouse,
-                        schema_list=args.schema_list)
+                        schema_list=args.schema_list,
+                        include_schemas=args.include_schemas,
+                        exclude_schemas=args.exclude_schemas,
+                        include_tables=args.include_tables,
+                        exclude_tables=args.exclude_tables,
+                        include_views=args.include_views,
+                        exclude_views=args.exclude_views)
+
+    # Only estimate the cost of the crawl when planning
+    if args.debug:
+        dbferret.plan_extraction()
+        return
 
     # Collect data
     table_metadata = dbferret.extract_table_metadata()
     view_ddls = dbferret.extract_view_ddl()
+    constraint_metadata = dbferret.extract_constraint_metadata()
 
     # Write results
     file_writer = FileWriter(db=args.db, engine_type=args.engine_type)
     file_writer.output_table_metadata_to_tsv(table_metadata)
     file_writer.output_view_ddl_to_sql(view_ddls)
+    for kind in constraint_metadata:
+        file_writer.output_constraint_metadata_to_tsv(
+            kind, constraint_metadata[kind])
 
 
 def parse_args():
@@ -114,7 +129,8 @@ def parse_args():
     parser.add_argument(
         "--debug",
         dest="debug",
-        help="Collects and diagnoses will be prepared but not run",
+        help="Plans the extraction with cheap count queries, estimating "
+             "round trips, time and memory, without extracting anything",
         action="store_true",
         default=False
     )
@@ -129,6 +145,20 @@ def parse_args():
         dest="schema_list",
         help="Comma delimited list of schemas"
     )
+    # argparse %-formats help text so the % wildcard has to be doubled
+    pattern_help = "Comma delimited patterns of {object_type} to {action}, " \
+                   "globs using * or %% as wildcards or regexes prefixed " \
+                   "with re:"
+    for object_type in ("schemas", "tables", "views"):
+        for option, action in (("include", "extract"), ("exclude", "skip")):
+            parser.add_argument(
+                "--{option}_{object_type}".format(
+                    option=option, object_type=object_type),
+                dest="{option}_{object_type}".format(
+                    option=option, object_type=object_type),
+                help=pattern_help.format(
+                    object_type=object_type, action=action)
+            )
     args = parser.parse_args()
     return args
 
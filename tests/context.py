@@ -5,6 +5,9 @@ import sys
 sys.path.insert(0, os.path.abspath(
     os.path.join(os.path.dirname(__file__), '..')))
 
+from dbferret import catalog
 from dbferret import helpers
+from dbferret import planner
 from dbferret import file_writer
+from dbferret import filters
 from dbferret import retriever
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+from context import catalog, filters
+
+
+def test_group_constraint_rows_primary_keys():
+    rows = [
+        {"table_name": "orders", "name": "orders_pkey",
+         "column_name": "line", "position": 2},
+        {"table_name": "orders", "name": "orders_pkey",
+         "column_name": "id", "position": 1},
+        {"table_name": "alerts", "name": "alerts_pkey",
+         "column_name": "id", "position": 1}]
+    assert catalog.group_constraint_rows("primary_keys", rows) == {
+        "orders": [{"name": "orders_pkey",
+                    "constrained_columns": ["id", "line"]}],
+        "alerts": [{"name": "alerts_pkey",
+                    "constrained_columns": ["id"]}]}
+
+
+def test_group_constraint_rows_foreign_keys():
+    rows = [
+        {"table_name": "transactions", "name": "transactions_user_fk",
+         "column_name": "user_id", "referred_schema": "public",
+         "referred_table": "users", "referred_column": "id",
+         "position": 1}]
+    assert catalog.group_constraint_rows("foreign_keys", rows) == {
+        "transactions": [{"name": "transactions_user_fk",
+                          "constrained_columns": ["user_id"],
+                          "referred_schema": "public",
+                          "referred_table": "users",
+                          "referred_columns": ["id"]}]}
+
+
+def test_group_constraint_rows_indexes():
+    rows = [
+        {"table_name": "transactions", "name": "sortkey",
+         "column_name": "insert_tz", "is_unique": False, "position": 1},
+        {"table_name": "transactions", "name": "distkey",
+         "column_name": "user_id", "is_unique": False, "position": 1}]
+    assert catalog.group_constraint_rows("indexes", rows) == {
+        "transactions": [
+            {"name": "distkey", "column_names": ["user_id"],
+             "unique": False},
+            {"name": "sortkey", "column_names": ["insert_tz"],
+             "unique": False}]}
+
+
+def test_group_constraint_rows_expression_indexes():
+    rows = [
+        {"table_name": "users", "name": "users_lower_email_idx",
+         "column_name": "lower((email)::text)", "is_unique": True,
+         "position": 0},
+        {"table_name": "users", "name": "users_org_lower_name_idx",
+         "column_name": "lower((name)::text)", "is_unique": False,
+         "position": 1},
+        {"table_name": "users", "name": "users_org_lower_name_idx",
+         "column_name": "org_id", "is_unique": False, "position": 0}]
+    assert catalog.group_constraint_rows("indexes", rows) == {
+        "users": [
+            {"name": "users_lower_email_idx",
+             "column_names": ["lower((email)::text)"], "unique": True},
+            {"name": "users_org_lower_name_idx",
+             "column_names": ["org_id", "lower((name)::text)"],
+             "unique": False}]}
+
+
+def test_get_catalog_sql_index_key_columns():
+    assert "k.i < ix.indnkeyatts" in catalog.get_catalog_sql(
+        "postgres", "indexes", (11, 2))
+    assert "k.i < ix.indnkeyatts" in catalog.get_catalog_sql(
+        "postgres", "indexes")
+    assert "k.i < ix.indnatts" in catalog.get_catalog_sql(
+        "postgres", "indexes", (10, 5))
+    assert "pg_get_indexdef" in catalog.get_catalog_sql(
+        "postgres", "indexes", (9, 6))
+    assert catalog.get_catalog_sql("redshift", "indexes") == \
+        catalog.REDSHIFT_INDEX_SQL
+    assert catalog.get_catalog_sql("snowflake", "indexes") is None
+    assert catalog.get_catalog_sql(None, "primary_keys") is None
+
+
+def test_build_names_query():
+    name_filter = filters.NameFilter(include="stg_*", exclude="*_bak")
+    sql, params = catalog.build_names_query(
+        "postgres", "views", "public", name_filter)
+    assert "c.relkind IN ('v', 'm')" in sql
+    assert "AND 1 = 1 AND (c.relname ~* :name_include_0) AND " \
+        "NOT (c.relname ~* :name_exclude_0)\n" in sql
+    assert "{name_filter}" not in sql
+    assert params == {"schema": "public",
+                      "name_include_0": "^stg_.*$",
+                      "name_exclude_0": "^.*_bak$"}
+
+    sql, params = catalog.build_names_query(
+        "snowflake", "tables", "PUBLIC", filters.NameFilter(exclude="tmp_%"))
+    assert "table_type NOT IN ('VIEW', 'MATERIALIZED VIEW')" in sql
+    assert "NOT (REGEXP_INSTR(table_name, :name_exclude_0, " \
+        "1, 1, 0, 'i') > 0)" in sql
+    assert params == {"schema": "PUBLIC", "name_exclude_0": "^tmp_.*$"}
+
+
+def test_build_column_count_query():
+    sql, params = catalog.build_column_count_query(
+        "redshift", "public", filters.NameFilter(exclude="tmp_%"))
+    assert "c.relkind IN ('r')" in sql
+    assert "NOT (c.relname ~* :table_exclude_0)" in sql
+    assert params == {"schema": "public", "table_exclude_0": "^tmp_.*$"}
+
+    sql, params = catalog.build_column_count_query(
+        "snowflake", "PUBLIC", filters.NameFilter(include="stg_*"))
+    assert "(REGEXP_INSTR(t.table_name, :table_include_0, " \
+        "1, 1, 0, 'i') > 0)" in sql
+    assert params == {"schema": "PUBLIC", "table_include_0": "^stg_.*$"}
+
+    sql, params = catalog.build_column_count_query(
+        None, "shop", filters.NameFilter(exclude="tmp_%"))
+    assert sql == catalog.INFORMATION_SCHEMA_COUNT_COLUMNS_SQL
+    assert params == {"schema": "shop"}
+
+
+def test_build_constraint_query():
+    sql, params = catalog.build_constraint_query(
+        "postgres", "primary_keys", "public", filters.NameFilter())
+    assert sql == catalog.CATALOG_SQL["postgres"]["primary_keys"]
+    assert params == {"schema": "public"}
+
+    sql, params = catalog.build_constraint_query(
+        "postgres", "indexes", "public",
+        filters.NameFilter(include="stg_*, events"), (10, 4))
+    assert sql == \
+        "SELECT * FROM ({sql}) q WHERE 1 = 1 AND " \
+        "(q.table_name ~* :table_include_0 OR " \
+        "q.table_name ~* :table_include_1)".format(
+            sql=catalog.get_catalog_sql("postgres", "indexes", (10, 4)))
+    assert params == {"schema": "public",
+                      "table_include_0": "^stg_.*$",
+                      "table_include_1": "^events$"}
+
+    sql, params = catalog.build_constraint_query(
+        "snowflake", "foreign_keys", '"PUBLIC"',
+        filters.NameFilter(exclude="tmp_%"))
+    assert sql == 'SHOW IMPORTED KEYS IN SCHEMA "PUBLIC"'
+    assert params == {}
@@ -90,3 +90,58 @@ def test_output_view_ddl_to_sql(tmpdir):
     assert \
         test_content.replace("\n", "") == \
         reference_content.replace("\n", "")
+
+
+def test_get_constraint_tsv_default_path():
+    fw = file_writer.FileWriter(db="test", engine_type="redshift")
+    ts = fw.timestamp
+    assert \
+        fw.get_constraint_tsv_default_path("indexes") == \
+        "data/redshift_test_indexes_{}.tsv".format(ts)
+
+
+def test_output_constraint_metadata_to_tsv(tmpdir):
+    # Create temporary location
+    test_dir = tmpdir.mkdir("constraint")
+
+    fw = file_writer.FileWriter(db="test", engine_type="postgresql")
+    foreign_keys = {
+        "public": {
+            "transactions": [
+                {"name": "transactions_user_fk",
+                 "constrained_columns": ["user_id"],
+                 "referred_schema": "public",
+                 "referred_table": "users",
+                 "referred_columns": ["id"]}]}}
+    output_file = test_dir.join("test_foreign_keys.tsv")
+    fw.output_constraint_metadata_to_tsv(
+        kind="foreign_keys", constraint_metadata=foreign_keys,
+        path=str(output_file))
+
+    with open("tests/fixtures/test_foreign_keys.tsv") as f:
+        reference_content = f.read()
+    test_content = output_file.read_text(encoding="UTF-8")
+
+    assert test_content == reference_content
+
+
+def test_output_constraint_metadata_to_tsv_expression_index(tmpdir):
+    # Create temporary location
+    test_dir = tmpdir.mkdir("index")
+
+    fw = file_writer.FileWriter(db="test", engine_type="postgresql")
+    indexes = {
+        "public": {
+            "users": [
+                {"name": "users_org_lower_name_idx",
+                 "column_names": ["org_id", None],
+                 "unique": False}]}}
+    output_file = test_dir.join("test_indexes.tsv")
+    fw.output_constraint_metadata_to_tsv(
+        kind="indexes", constraint_metadata=indexes, path=str(output_file))
+
+    with open("tests/fixtures/test_indexes.tsv") as f:
+        reference_content = f.read()
+    test_content = output_file.read_text(encoding="UTF-8")
+
+    assert test_content == reference_content
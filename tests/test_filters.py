@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from context import filters
+
+
+def test_parse_patterns():
+    assert filters.parse_patterns(None) == []
+    assert filters.parse_patterns("") == []
+    assert filters.parse_patterns("tmp_%, *_bak,") == ["tmp_%", "*_bak"]
+    assert filters.parse_patterns(["a", " b "]) == ["a", "b"]
+
+
+def test_pattern_to_regex():
+    assert filters.pattern_to_regex("tmp_%") == "^tmp_.*$"
+    assert filters.pattern_to_regex("*_bak") == "^.*_bak$"
+    assert filters.pattern_to_regex("stg_2019_??") == "^stg_2019_..$"
+    assert filters.pattern_to_regex("a.b") == "^a\\.b$"
+    assert filters.pattern_to_regex("re:_p[0-9]+$") == "_p[0-9]+$"
+
+
+def test_name_filter_matches():
+    name_filter = filters.NameFilter(
+        include="stg_*, events", exclude="*_bak, re:_p[0-9]+$")
+    assert name_filter
+    assert name_filter.matches("STG_Orders")
+    assert name_filter.matches("events")
+    assert not name_filter.matches("events_bak")
+    assert not name_filter.matches("stg_orders_p201901")
+    assert not name_filter.matches("orders")
+    assert not filters.NameFilter()
+    assert filters.NameFilter().filter_names(["a", "b"]) == ["a", "b"]
+    assert filters.NameFilter(exclude="tmp_%").filter_names(
+        ["tmp_load", "orders"]) == ["orders"]
+
+
+def test_name_filter_to_sql():
+    assert filters.NameFilter().to_sql("c.relname", "postgres", "t") == \
+        ("1 = 1", {})
+    clause, params = filters.NameFilter(
+        include="stg_*", exclude="tmp_%, *_bak").to_sql(
+            "c.relname", "redshift", "t")
+    assert clause == \
+        "1 = 1 AND (c.relname ~* :t_include_0) AND " \
+        "NOT (c.relname ~* :t_exclude_0 OR c.relname ~* :t_exclude_1)"
+    assert params == {"t_include_0": "^stg_.*$",
+                      "t_exclude_0": "^tmp_.*$",
+                      "t_exclude_1": "^.*_bak$"}
+    clause, params = filters.NameFilter(exclude="tmp_%").to_sql(
+        "table_name", "snowflake", "t")
+    assert clause == \
+        "1 = 1 AND NOT (REGEXP_INSTR(table_name, :t_exclude_0, " \
+        "1, 1, 0, 'i') > 0)"
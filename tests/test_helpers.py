@@ -11,6 +11,17 @@ def test_elapsed_time():
     assert helpers.elapsed_time((5 * 60) + 1) == "0 hr 5 min 1 sec"
     assert helpers.elapsed_time((61 * 60) + 1) == "1 hr 1 min 1 sec"
     assert helpers.elapsed_time((60 * 60 * 12) + 18) == "12 hr 0 min 18 sec"
+    assert helpers.elapsed_time(90000) == "25 hr 0 min 0 sec"
+    assert helpers.elapsed_time((60 * 60 * 73) + 62.5) == "73 hr 1 min 2 sec"
+
+
+def test_readable_size():
+    assert helpers.readable_size(0) == "0.0 B"
+    assert helpers.readable_size(512) == "512.0 B"
+    assert helpers.readable_size(1024) == "1.0 KB"
+    assert helpers.readable_size(1536 * 1024) == "1.5 MB"
+    assert helpers.readable_size(3 * 1024 ** 3) == "3.0 GB"
+    assert helpers.readable_size(2 * 1024 ** 4) == "2.0 TB"
 
 
 def test_incremental_marker():
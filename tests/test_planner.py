@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from context import planner
+
+
+COUNTS = {
+    "public": {"tables": 10, "views": 4, "columns": 100},
+    "staging": {"tables": 5, "views": 1, "columns": 50}}
+
+
+def test_median():
+    assert planner.median([]) == 0
+    assert planner.median([0.3, 0.1, 0.2]) == 0.2
+    assert planner.median([0.4, 0.1, 0.2, 0.3]) == 0.25
+
+
+def test_estimate_extraction_postgres():
+    plan = planner.estimate_extraction(COUNTS, 0.5, "postgres")
+    assert plan["tables"] == 15
+    assert plan["views"] == 5
+    assert plan["columns"] == 150
+    # schema listing + table listing per schema + oid, columns, domains
+    # and enums per table
+    assert plan["round_trips"] == {
+        "table columns (inspector)": 1 + 2 + 15 * 4,
+        "view ddl (inspector)": 1 + 2 + 5,
+        "constraints (inspector)": 1 + 2 + 15 * 6,
+        "constraints (catalog)": 1 + 2 * 4}
+    assert plan["estimated_seconds"]["constraints (catalog)"] == 4.5
+    assert plan["estimated_bytes"] == \
+        150 * planner.BYTES_PER_COLUMN + \
+        5 * planner.BYTES_PER_VIEW + \
+        15 * 4 * planner.BYTES_PER_CONSTRAINT
+
+
+def test_estimate_extraction_schema_list():
+    listed = planner.estimate_extraction(
+        COUNTS, 0.5, "redshift", schema_list=True)
+    unlisted = planner.estimate_extraction(COUNTS, 0.5, "redshift")
+    for strategy in unlisted["round_trips"]:
+        assert listed["round_trips"][strategy] == \
+            unlisted["round_trips"][strategy] - 1
+
+
+def test_estimate_extraction_snowflake():
+    plan = planner.estimate_extraction(COUNTS, 1, "snowflake")
+    # Columns and keys are fetched per schema and cached
+    assert plan["round_trips"] == {
+        "table columns (inspector)": 1 + 2 + 2,
+        "view ddl (inspector)": 1 + 2 + 5,
+        "constraints (inspector)": 1 + 2 + 2 * 3,
+        "constraints (catalog)": 1 + 2 * 3}
+
+
+def test_estimate_extraction_without_catalog():
+    plan = planner.estimate_extraction(COUNTS, 2, "mysql", schema_list=True)
+    assert plan["round_trips"] == {
+        "table columns (inspector)": 2 + 15,
+        "view ddl (inspector)": 2 + 5,
+        "constraints (inspector)": 2 + 15 * 4}
+    assert plan["estimated_seconds"]["table columns (inspector)"] == 34
+
+
+def test_estimate_extraction_unknown_columns():
+    counts = {
+        "main": {"tables": 3, "views": 1, "columns": None},
+        "other": {"tables": 2, "views": 0, "columns": 10}}
+    plan = planner.estimate_extraction(counts, 1, None, schema_list=True)
+    assert plan["tables"] == 5
+    assert plan["columns"] is None
+    assert plan["estimated_bytes"] is None
+    assert plan["round_trips"]["table columns (inspector)"] == 2 + 5